@@ -4,6 +4,14 @@ Voara Voice Agent - Agent Module
 LiveKit Voice Agent with Gemini Live API and RAG integration.
 """
 
+from dotenv import find_dotenv, load_dotenv
+
+# AgentSettings and RAGSettings read only os.environ, so .env must be loaded
+# before the submodules below build the shared RAG retriever at import time.
+# Run as `python -m agent.main`, this package is imported before agent/main.py
+# gets to its own load_dotenv() call.
+load_dotenv(find_dotenv(usecwd=True))
+
 from .config import get_agent_settings, validate_agent_settings, VOARA_SYSTEM_INSTRUCTIONS
 from .voice_agent import VoaraAgent, create_agent, setup_session_events
 from .tools import RAG_TOOLS, search_knowledge_base
@@ -0,0 +1,22 @@
+"""
+Shared RAG Retriever
+
+Single retriever instance shared by the function tools and the agent.
+Created at import so the first user turn doesn't pay for initialization.
+"""
+
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Module-level retriever (None if RAG could not be initialized)
+RETRIEVER = None
+RAG_AVAILABLE = False
+
+try:
+    from rag import Retriever, SemanticCache
+    RETRIEVER = SemanticCache(Retriever())
+    RAG_AVAILABLE = True
+    logger.info("RAG retriever initialized")
+except Exception as e:
+    logger.error(f"Failed to initialize RAG retriever: {e}")
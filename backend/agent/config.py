@@ -6,6 +6,7 @@ Loads and validates configuration for the LiveKit Voice Agent.
 
 import os
 from functools import lru_cache
+from typing import Optional
 from pydantic_settings import BaseSettings
 from pydantic import Field
 
@@ -36,6 +37,16 @@ class AgentSettings(BaseSettings):
         ge=0.0,
         le=2.0
     )
+    thinking_budget: int = Field(
+        default=0,
+        description="Thinking token budget per turn (0 disables thinking, -1 keeps the model's default)",
+        ge=-1
+    )
+    max_output_tokens: Optional[int] = Field(
+        default=None,
+        description="Cap on generated tokens per turn (None for no cap)",
+        gt=0
+    )
     
     # RAG Configuration
     enable_rag: bool = Field(
@@ -48,26 +59,38 @@ class AgentSettings(BaseSettings):
     )
     
     class Config:
-        env_file = ".env"
-        env_file_encoding = "utf-8"
         extra = "ignore"
 
 
 @lru_cache()
 def get_agent_settings() -> AgentSettings:
-    """Get cached agent settings instance."""
-    return AgentSettings()
+    """
+    Get cached agent settings instance.
+    
+    Settings are validated once, when first loaded; raises ValueError if
+    required settings are missing.
+    """
+    settings = AgentSettings()
+    _check_required_settings(settings)
+    return settings
 
 
 def validate_agent_settings() -> bool:
     """
     Validate that all required settings are configured.
     
+    Validation happens when the cached settings are first loaded, so
+    repeated calls are free.
+    
     Returns:
         True if all required settings are present, raises ValueError otherwise.
     """
-    settings = get_agent_settings()
-    
+    get_agent_settings()
+    return True
+
+
+def _check_required_settings(settings: AgentSettings) -> None:
+    """Raise ValueError listing any missing required settings."""
     errors = []
     
     if not settings.livekit_url:
@@ -81,8 +104,6 @@ def validate_agent_settings() -> bool:
     
     if errors:
         raise ValueError(f"Missing required configuration: {', '.join(errors)}")
-    
-    return True
 
 
 # System prompt for Voara AI - emphasizes using the knowledge base tool
@@ -19,10 +19,11 @@ from dotenv import load_dotenv
 load_dotenv()
 
 from livekit import agents, rtc
-from livekit.agents import AgentServer, AgentSession, room_io, cli
+from livekit.agents import AgentServer, AgentSession, JobProcess, room_io, cli
 from livekit.plugins import google, silero
+from google.genai import types
 
-from .config import get_agent_settings, validate_agent_settings, VOARA_SYSTEM_INSTRUCTIONS
+from .config import AgentSettings, get_agent_settings, VOARA_SYSTEM_INSTRUCTIONS
 from .voice_agent import VoaraAgent, setup_session_events
 from .tools import RAG_TOOLS
 
@@ -34,17 +35,35 @@ logging.basicConfig(
 logger = logging.getLogger(__name__)
 
 
-# Validate settings on import
-try:
-    validate_agent_settings()
-    logger.info("Agent settings validated successfully")
-except ValueError as e:
-    logger.error(f"Configuration error: {e}")
-    logger.error("Please set required environment variables in .env file")
+def prewarm(proc: JobProcess):
+    """
+    Load models once per worker process.
+    
+    The Silero VAD model is shared by every session the process runs
+    instead of being reloaded from disk on each room join.
+    """
+    proc.userdata["vad"] = silero.VAD.load()
+    logger.info("Silero VAD model preloaded")
+
+
+def _generation_options(settings: AgentSettings) -> dict:
+    """
+    Build the optional generation arguments for the realtime model.
+    
+    Thinking adds latency before the first audio of every turn, so it is
+    disabled by default. A thinking budget of -1 and an unset output cap
+    keep the model's own defaults.
+    """
+    options = {}
+    if settings.thinking_budget >= 0:
+        options["thinking_config"] = types.ThinkingConfig(thinking_budget=settings.thinking_budget)
+    if settings.max_output_tokens is not None:
+        options["max_output_tokens"] = settings.max_output_tokens
+    return options
 
 
 # Create agent server
-server = AgentServer()
+server = AgentServer(setup_fnc=prewarm)
 
 
 @server.rtc_session()
@@ -88,8 +107,9 @@ async def voara_agent(ctx: agents.JobContext):
             voice=settings.gemini_voice,
             temperature=settings.temperature,
             instructions=VOARA_SYSTEM_INSTRUCTIONS,
+            **_generation_options(settings),
         ),
-        vad=silero.VAD.load(),  # Voice Activity Detection
+        vad=ctx.proc.userdata["vad"],  # Voice Activity Detection (preloaded in prewarm)
         tools=RAG_TOOLS,  # Pass RAG function tools for dynamic retrieval
     )
     
@@ -162,6 +182,14 @@ def main():
         logger.info("Model files downloaded successfully")
         return
     
+    # Validate settings once (cached for the rest of the process)
+    try:
+        get_agent_settings()
+        logger.info("Agent settings validated successfully")
+    except ValueError as e:
+        logger.error(f"Configuration error: {e}")
+        logger.error("Please set required environment variables in .env file")
+    
     # Start the agent server
     logger.info("Starting Voara Voice Agent...")
     logger.info(f"LiveKit URL: {os.getenv('LIVEKIT_URL', 'not set')}")
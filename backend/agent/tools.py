@@ -5,14 +5,36 @@ Defines function calling tools for RAG retrieval that can be used
 by the Gemini Live API during conversations.
 """
 
+import asyncio
+import datetime
 import json
 import logging
+import os
+import re
+import threading
+import weakref
 from livekit.agents import function_tool, RunContext
 
+from .config import get_agent_settings
+from ._retriever import RETRIEVER
+
 logger = logging.getLogger(__name__)
 
-# Global retriever instance (lazy loaded)
-_retriever = None
+# Shared with the API process, which serves it to the frontend
+CONTEXT_FILE = os.path.join(os.path.dirname(__file__), "..", "rag_context.json")
+
+# Background context-file writes (referenced so they aren't garbage collected)
+_pending_writes: set[asyncio.Task] = set()
+
+# Serializes those writes so an older snapshot never lands after a newer one.
+# Kept per event loop, since agent jobs may each run their own loop in a
+# separate thread and asyncio locks are bound to one loop.
+_write_locks: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, asyncio.Lock]" = (
+    weakref.WeakKeyDictionary()
+)
+
+# Keeps writes from different threads from interleaving in the file
+_file_lock = threading.Lock()
 
 # Global storage for last RAG context (for frontend display)
 _last_rag_context = {
@@ -22,22 +44,75 @@ _last_rag_context = {
 }
 
 
+# Conversational glue the model sometimes sends as a search query. These
+# can never match the knowledge base, so they skip embedding and search.
+_SMALL_TALK = frozenset({
+    "hi", "hello", "hey", "hiya", "yo",
+    "thanks", "thank you", "thx", "cheers",
+    "ok", "okay", "sure", "yes", "yeah", "yep", "no", "nope",
+    "bye", "goodbye", "good bye", "see you",
+    "good morning", "good afternoon", "good evening",
+    "how are you", "nice to meet you",
+    "مرحبا", "اهلا", "أهلا", "السلام عليكم", "شكرا", "نعم", "لا", "تمام", "مع السلامة",
+})
+
+# Small talk with filler around it, e.g. "hi there" or "ok thanks a lot"
+_SMALL_TALK_PATTERN = re.compile(
+    r"^(?:(?:hi|hello|hey|ok|okay|yes|yeah|sure|great|cool|thanks|thank you|bye)"
+    r"(?:\s+(?:there|again|so much|a lot|very much|you|then|bye))*\s*)+$"
+)
+
+_PUNCTUATION = re.compile(r"[^\w\s]+")
+
+# Returned to the model when a lookup is skipped
+_NO_LOOKUP_NEEDED = "No knowledge base lookup is needed for this message. Respond conversationally."
+
+
+def _is_trivial(query: str) -> bool:
+    """
+    Check whether a query is small talk that needs no retrieval.
+    
+    Args:
+        query: The search query from the model
+        
+    Returns:
+        True if the query is a greeting, thanks or plain affirmation
+    """
+    normalized = " ".join(_PUNCTUATION.sub(" ", query.lower()).split())
+    if not normalized:
+        return True
+    return normalized in _SMALL_TALK or _SMALL_TALK_PATTERN.match(normalized) is not None
+
+
 def get_last_rag_context():
     """Get the last RAG context for API endpoint."""
     return _last_rag_context
 
 
-async def _get_retriever():
-    """Lazy-load the RAG retriever."""
-    global _retriever
-    if _retriever is None:
-        try:
-            from rag import Retriever
-            _retriever = Retriever()
-            logger.info("RAG retriever initialized for function tools")
-        except Exception as e:
-            logger.error(f"Failed to initialize RAG retriever: {e}")
-    return _retriever
+def _write_context_file(payload: dict) -> str:
+    """
+    Write the RAG context to disk for the API process (blocking).
+    
+    Returns:
+        Path of the written file
+    """
+    with _file_lock, open(CONTEXT_FILE, "w", encoding="utf-8") as f:
+        json.dump(payload, f, ensure_ascii=False)
+    return CONTEXT_FILE
+
+
+async def _persist_context(payload: dict) -> None:
+    """Write the RAG context file off the event loop, logging failures."""
+    loop = asyncio.get_running_loop()
+    write_lock = _write_locks.get(loop)
+    if write_lock is None:
+        write_lock = _write_locks[loop] = asyncio.Lock()
+    try:
+        async with write_lock:
+            context_file = await asyncio.to_thread(_write_context_file, payload)
+        logger.info(f"[RAG Tool] Context saved to {context_file}")
+    except Exception as write_err:
+        logger.warning(f"[RAG Tool] Failed to save context file: {write_err}")
 
 
 @function_tool(
@@ -68,50 +143,45 @@ async def search_knowledge_base(
     Returns:
         Relevant information from the knowledge base
     """
-    global _last_rag_context
-    import datetime
+    if _is_trivial(query):
+        logger.debug(f"[RAG Tool] Skipping lookup for small talk: {query}")
+        return _NO_LOOKUP_NEEDED
     
     logger.info(f"[RAG Tool] Searching knowledge base for: {query}")
     
-    retriever = await _get_retriever()
-    if retriever is None:
+    if RETRIEVER is None:
         logger.warning("[RAG Tool] Retriever not available")
         return "I apologize, but I'm unable to access the knowledge base at the moment. Please try again."
     
     try:
-        result = await retriever.retrieve_context(
+        result = await RETRIEVER.retrieve_context(
             query=query,
+            top_k=get_agent_settings().rag_top_k,
             include_metadata=False
         )
         
+        timestamp = datetime.datetime.now().isoformat()
+        
         if result:
             logger.info(f"[RAG Tool] Retrieved {len(result)} chars of context")
             
             # Store for frontend access - write to file for cross-process sharing
-            _last_rag_context = {
-                "query": query,
-                "context": result,
-                "timestamp": datetime.datetime.now().isoformat()
-            }
+            _last_rag_context.update(query=query, context=result, timestamp=timestamp)
             
-            # Write to file so API can read it
-            try:
-                import os
-                context_file = os.path.join(os.path.dirname(__file__), "..", "rag_context.json")
-                with open(context_file, "w", encoding="utf-8") as f:
-                    json.dump(_last_rag_context, f, ensure_ascii=False)
-                logger.info(f"[RAG Tool] Context saved to {context_file}")
-            except Exception as write_err:
-                logger.warning(f"[RAG Tool] Failed to save context file: {write_err}")
+            # Write a snapshot to file in the background so the model gets
+            # the result without waiting on disk
+            task = asyncio.create_task(_persist_context(dict(_last_rag_context)))
+            _pending_writes.add(task)
+            task.add_done_callback(_pending_writes.discard)
             
             return result
         else:
             logger.info("[RAG Tool] No relevant information found")
-            _last_rag_context = {
-                "query": query,
-                "context": "No specific information found.",
-                "timestamp": datetime.datetime.now().isoformat()
-            }
+            _last_rag_context.update(
+                query=query,
+                context="No specific information found.",
+                timestamp=timestamp
+            )
             return "No specific information found in the knowledge base for this query."
             
     except Exception as e:
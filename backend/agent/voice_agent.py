@@ -4,17 +4,37 @@ Voara Voice Agent Logic
 Implements the voice agent using LiveKit Agents with Gemini Live API and RAG.
 """
 
-import asyncio
 import logging
+from functools import lru_cache
 from typing import Optional
 
 from livekit import rtc
 from livekit.agents import Agent, AgentSession, UserInputTranscribedEvent
 
 from .config import get_agent_settings, VOARA_SYSTEM_INSTRUCTIONS
+from ._retriever import RETRIEVER, RAG_AVAILABLE
 
 logger = logging.getLogger(__name__)
 
+# Fixed text wrapped around the knowledge base context in the instructions.
+# Keeping it constant leaves the instructions as a stable, cacheable prefix.
+_CONTEXT_PREFIX = (
+    "\n\n---\n"
+    "KNOWLEDGE BASE CONTEXT:\n"
+    "Use the following information to answer the user's question:\n\n"
+)
+_CONTEXT_SUFFIX = (
+    "\n\n---\n"
+    "Remember to base your answer on this context. If the context doesn't "
+    "contain the answer, acknowledge that and offer what help you can."
+)
+
+
+@lru_cache(maxsize=64)
+def _compose_instructions(instructions: str, context: str) -> str:
+    """Join instructions and context (memoized, as contexts often repeat)."""
+    return "".join((instructions, _CONTEXT_PREFIX, context, _CONTEXT_SUFFIX))
+
 
 class VoaraAgent(Agent):
     """
@@ -36,8 +56,8 @@ class VoaraAgent(Agent):
             base_instructions: Custom base instructions (defaults to Voara system prompt)
             enable_rag: Whether to enable RAG context retrieval
         """
-        self.enable_rag = enable_rag
-        self._retriever = None
+        self.enable_rag = enable_rag and RAG_AVAILABLE
+        self._retriever = RETRIEVER if self.enable_rag else None
         self._last_context = ""
         self._last_query = ""
         
@@ -46,19 +66,7 @@ class VoaraAgent(Agent):
         
         super().__init__(instructions=instructions)
         
-        logger.info(f"VoaraAgent initialized (RAG enabled: {enable_rag})")
-    
-    async def _get_retriever(self):
-        """Lazy-load the RAG retriever."""
-        if self._retriever is None and self.enable_rag:
-            try:
-                from rag import Retriever
-                self._retriever = Retriever()
-                logger.info("RAG retriever initialized")
-            except Exception as e:
-                logger.error(f"Failed to initialize RAG retriever: {e}")
-                self.enable_rag = False
-        return self._retriever
+        logger.info(f"VoaraAgent initialized (RAG enabled: {self.enable_rag})")
     
     async def retrieve_context(self, query: str) -> str:
         """
@@ -70,16 +78,13 @@ class VoaraAgent(Agent):
         Returns:
             Formatted context string for LLM consumption
         """
-        if not self.enable_rag:
+        if not self.enable_rag or self._retriever is None:
             return ""
         
         try:
-            retriever = await self._get_retriever()
-            if retriever is None:
-                return ""
-            
-            context = await retriever.retrieve_context(
+            context = await self._retriever.retrieve_context(
                 query=query,
+                top_k=get_agent_settings().rag_top_k,
                 include_metadata=False
             )
             
@@ -107,16 +112,7 @@ class VoaraAgent(Agent):
         if not context:
             return self.instructions
         
-        return f"""{self.instructions}
-
----
-KNOWLEDGE BASE CONTEXT:
-Use the following information to answer the user's question:
-
-{context}
-
----
-Remember to base your answer on this context. If the context doesn't contain the answer, acknowledge that and offer what help you can."""
+        return _compose_instructions(self.instructions, context)
     
     @property
     def last_context(self) -> str:
@@ -137,7 +133,8 @@ def setup_session_events(
     """
     Set up event handlers for the agent session.
     
-    Handles transcription events and RAG context injection.
+    Handles transcription events. Knowledge base lookups are left to the
+    model via the search_knowledge_base tool, so transcripts are only logged.
     
     Args:
         session: The AgentSession instance
@@ -145,8 +142,11 @@ def setup_session_events(
         room: The LiveKit room
     """
     
-    async def _handle_user_input(event: UserInputTranscribedEvent):
-        """Async handler for user speech transcription."""
+    @session.on("user_input_transcribed")
+    def on_user_input_transcribed(event: UserInputTranscribedEvent):
+        """Log final user transcripts."""
+        # Handled inline: there is no async work here, so spawning a task
+        # per transcript would only pile up untracked tasks
         if not event.is_final:
             return
         
@@ -155,22 +155,6 @@ def setup_session_events(
             return
         
         logger.info(f"User said: {transcript}")
-        
-        # Retrieve RAG context for the user's query
-        if agent.enable_rag and transcript:
-            context = await agent.retrieve_context(transcript)
-            
-            if context:
-                # Update room metadata with context (for UI display)
-                try:
-                    logger.info("RAG context retrieved and ready")
-                except Exception as e:
-                    logger.warning(f"Failed to update metadata: {e}")
-    
-    @session.on("user_input_transcribed")
-    def on_user_input_transcribed(event: UserInputTranscribedEvent):
-        """Sync callback that spawns async task."""
-        asyncio.create_task(_handle_user_input(event))
     
     logger.info("Session event handlers configured")
 
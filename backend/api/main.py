@@ -5,19 +5,27 @@ Entry point for the Voara Voice Agent REST API.
 Handles token generation and health checks.
 """
 
+import asyncio
+import contextlib
 import logging
+import os
 from contextlib import asynccontextmanager
+from typing import Optional
 
 from dotenv import load_dotenv
 
 # Load environment variables from .env file
 load_dotenv()
 
+import orjson
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.responses import ORJSONResponse, Response
+from starlette.types import Receive, Scope, Send
 
 from .routes import token, health, rag
-from rag import get_qdrant_service
+from rag import QdrantService, get_qdrant_service
 
 # Configure logging
 logging.basicConfig(
@@ -26,21 +34,33 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Interactive docs and the OpenAPI schema are only served in debug mode
+DEBUG = os.getenv("VOARA_DEBUG", "false").lower() in ("1", "true", "yes")
 
-@asynccontextmanager
-async def lifespan(app: FastAPI):
+
+class StreamingGZipMiddleware(GZipMiddleware):
     """
-    Application lifespan manager.
+    GZipMiddleware that leaves streaming endpoints uncompressed.
     
-    Handles startup and shutdown events for resource management.
+    Starlette only passes text/event-stream through; other streams are
+    compressed into a buffer that is not flushed between chunks, so the
+    client would receive nothing until the response closes.
     """
-    # Startup
-    logger.info("Starting Voara Voice Agent API...")
     
-    # Initialize Qdrant connection
-    qdrant = get_qdrant_service()
+    def __init__(self, app, excluded_paths: frozenset[str] = frozenset(), **kwargs):
+        super().__init__(app, **kwargs)
+        self.excluded_paths = excluded_paths
+    
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] == "http" and scope["path"] in self.excluded_paths:
+            await self.app(scope, receive, send)
+            return
+        await super().__call__(scope, receive, send)
+
+
+async def _verify_qdrant(qdrant: QdrantService) -> None:
+    """Check the Qdrant collection exists and log the outcome."""
     try:
-        # Verify connection works
         exists = await qdrant.collection_exists()
         if exists:
             logger.info("Connected to Qdrant - collection exists")
@@ -48,6 +68,22 @@ async def lifespan(app: FastAPI):
             logger.warning("Qdrant collection does not exist - run ingestion script first")
     except Exception as e:
         logger.warning(f"Could not connect to Qdrant: {e}")
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """
+    Application lifespan manager.
+    
+    Handles startup and shutdown events for resource management.
+    """
+    # Startup
+    logger.info("Starting Voara Voice Agent API...")
+    
+    # Verify the Qdrant connection in the background so startup doesn't
+    # wait on a round-trip to Qdrant Cloud
+    qdrant = get_qdrant_service()
+    verify_task = asyncio.create_task(_verify_qdrant(qdrant))
     
     logger.info("API startup complete")
     
@@ -56,6 +92,10 @@ async def lifespan(app: FastAPI):
     # Shutdown
     logger.info("Shutting down Voara Voice Agent API...")
     
+    verify_task.cancel()
+    with contextlib.suppress(asyncio.CancelledError):
+        await verify_task
+    
     # Close Qdrant connection
     await qdrant.close()
     
@@ -68,8 +108,10 @@ app = FastAPI(
     description="REST API for the Voara AI Voice Agent with LiveKit and RAG",
     version="0.1.0",
     lifespan=lifespan,
-    docs_url="/docs",
-    redoc_url="/redoc",
+    docs_url="/docs" if DEBUG else None,
+    redoc_url="/redoc" if DEBUG else None,
+    openapi_url="/openapi.json" if DEBUG else None,
+    default_response_class=ORJSONResponse,
 )
 
 # Configure CORS
@@ -82,8 +124,18 @@ app.add_middleware(
     ],
     allow_origin_regex=r"https://.*\.vercel\.app",  # All Vercel preview deployments
     allow_credentials=True,
-    allow_methods=["GET", "POST", "PUT", "DELETE", "OPTIONS"],
+    allow_methods=["GET", "POST", "DELETE", "OPTIONS"],  # No endpoint accepts PUT
     allow_headers=["*"],
+    max_age=86400,  # Let browsers cache preflight responses for a day
+)
+
+# Compress larger responses (RAG context and query results are plain text),
+# except the NDJSON stream, whose lines must reach the client as produced
+app.add_middleware(
+    StreamingGZipMiddleware,
+    minimum_size=1024,
+    compresslevel=5,
+    excluded_paths=frozenset({"/api/rag/query/stream"})
 )
 
 # Register routers
@@ -91,6 +143,23 @@ app.include_router(token.router, prefix="/api", tags=["Token"])
 app.include_router(health.router, prefix="/api", tags=["Health"])
 app.include_router(rag.router, prefix="/api", tags=["RAG"])
 
+if DEBUG:
+    # FastAPI memoizes the schema dict but re-encodes it on every request;
+    # replace its route with one serving the orjson-encoded schema, built once
+    app.router.routes = [
+        route for route in app.router.routes
+        if getattr(route, "path", None) != app.openapi_url
+    ]
+    _openapi_body: Optional[bytes] = None
+    
+    @app.get(app.openapi_url, include_in_schema=False)
+    async def openapi_json() -> Response:
+        """Serve the cached OpenAPI schema."""
+        global _openapi_body
+        if _openapi_body is None:
+            _openapi_body = orjson.dumps(app.openapi())
+        return Response(content=_openapi_body, media_type="application/json")
+
 
 @app.get("/")
 async def root():
@@ -98,18 +167,22 @@ async def root():
     return {
         "name": "Voara Voice Agent API",
         "version": "0.1.0",
-        "docs": "/docs"
+        "docs": app.docs_url
     }
 
 
 def start():
     """Entry point for poetry script."""
+    import sys
     import uvicorn
     uvicorn.run(
         "api.main:app",
         host="0.0.0.0",
         port=8000,
         reload=True,
+        # uvloop and httptools come with uvicorn[standard]; uvloop has no Windows build
+        loop="asyncio" if sys.platform == "win32" else "uvloop",
+        http="httptools",
         log_level="info"
     )
 
@@ -4,18 +4,73 @@ RAG Query Route
 Provides endpoints for testing and debugging the RAG pipeline.
 """
 
+import asyncio
 import logging
+import time
+from functools import lru_cache
+from pathlib import Path
 from typing import Optional
 
+import orjson
 from fastapi import APIRouter, HTTPException
+from fastapi.responses import ORJSONResponse, Response, StreamingResponse
 from pydantic import BaseModel, Field
 
-from rag import Retriever, get_rag_settings
+from rag import (
+    CONTEXT_SEPARATOR,
+    Retriever,
+    RetrievalResult,
+    SemanticCache,
+    format_context,
+    get_qdrant_service,
+    get_rag_settings
+)
 
 logger = logging.getLogger(__name__)
 
 router = APIRouter()
 
+# Latest agent context, written by the agent process (agent/tools.py)
+CONTEXT_FILE = Path(__file__).resolve().parent.parent.parent / "rag_context.json"
+
+# Written by clear_context to reset the shared file
+_EMPTY_CONTEXT_FILE = orjson.dumps({"query": "", "context": "", "timestamp": None})
+
+# Encoded /rag/context body, keyed by the context file's (mtime, size)
+_context_cache: dict = {"key": None, "body": b""}
+
+# Collection info for /rag/stats, refreshed at most every STATS_TTL_SECONDS
+STATS_TTL_SECONDS = 10
+_stats_cache: dict = {"fetched_at": float("-inf"), "info": None}
+
+# Stricter than the agent's cache: this endpoint is for checking retrieval
+# accuracy, so only near-identical phrasings should reuse results
+QUERY_CACHE_SIMILARITY = 0.97
+
+
+@lru_cache(maxsize=1)
+def get_retriever() -> Retriever:
+    """
+    Get the Retriever shared by all RAG requests.
+    
+    top_k is passed per call, so one instance serves every request.
+    
+    Returns:
+        Retriever with default settings
+    """
+    return Retriever()
+
+
+@lru_cache(maxsize=1)
+def get_query_cache() -> SemanticCache:
+    """
+    Get the semantic query cache shared by RAG query requests.
+    
+    Returns:
+        SemanticCache wrapping the shared Retriever
+    """
+    return SemanticCache(get_retriever(), similarity_threshold=QUERY_CACHE_SIMILARITY)
+
 
 class RAGQueryRequest(BaseModel):
     """Request model for RAG query."""
@@ -39,7 +94,7 @@ class RAGResult(BaseModel):
     """A single RAG retrieval result."""
     
     text: str = Field(..., description="The retrieved text chunk")
-    score: float = Field(..., description="Similarity score")
+    score: float = Field(..., description="Relevance score (fused rank score with hybrid search)")
     header: str = Field(default="", description="Section header if available")
     source: str = Field(default="", description="Source document")
 
@@ -53,65 +108,115 @@ class RAGQueryResponse(BaseModel):
     retrieval_time_ms: float = Field(..., description="Retrieval time in milliseconds")
 
 
-@router.post("/rag/query", response_model=RAGQueryResponse)
-async def query_rag(request: RAGQueryRequest) -> RAGQueryResponse:
+async def _run_query(request: RAGQueryRequest) -> tuple[list[RetrievalResult], float]:
     """
-    Query the RAG pipeline and return retrieved chunks.
-    
-    Useful for testing and debugging RAG retrieval accuracy.
+    Retrieve results for a query through the shared query cache.
     
     Args:
         request: Query request with search text
         
     Returns:
-        RAGQueryResponse with retrieved chunks and formatted context
+        Tuple of (results, retrieval time in milliseconds)
     """
-    import time
-    
     settings = get_rag_settings()
+    cache = get_query_cache()
+    top_k = request.top_k or settings.top_k
     
-    try:
-        retriever = Retriever(
-            top_k=request.top_k or settings.top_k
-        )
-        
-        start_time = time.time()
-        
-        # Get results with sources
-        context, sources = await retriever.retrieve_with_sources(
-            query=request.query,
-            top_k=request.top_k
-        )
+    start_ns = time.perf_counter_ns()
+    results = await cache.retrieve(
+        query=request.query,
+        top_k=top_k
+    )
+    retrieval_time = (time.perf_counter_ns() - start_ns) / 1_000_000
+    
+    return results, round(retrieval_time, 2)
+
+
+def _result_dict(result: RetrievalResult) -> dict:
+    """Serialize a retrieval result in the RAGResult shape."""
+    return {
+        "text": result.text,
+        "score": result.score,
+        "header": result.header,
+        "source": result.source
+    }
+
+
+@router.post(
+    "/rag/query",
+    response_class=ORJSONResponse,
+    responses={200: {"model": RAGQueryResponse}}
+)
+async def query_rag(request: RAGQueryRequest) -> ORJSONResponse:
+    """
+    Query the RAG pipeline and return retrieved chunks.
+    
+    Useful for testing and debugging RAG retrieval accuracy. The response
+    follows RAGQueryResponse but is built directly from the retrieval
+    results, skipping a second validation pass.
+    
+    Args:
+        request: Query request with search text
         
-        # Get full results for detailed info
-        results = await retriever.retrieve(
-            query=request.query,
-            top_k=request.top_k
-        )
+    Returns:
+        RAGQueryResponse-shaped JSON with retrieved chunks and formatted context
+    """
+    try:
+        # One retrieval; the context and result list are both derived from it
+        results, retrieval_time = await _run_query(request)
         
-        retrieval_time = (time.time() - start_time) * 1000
+        return ORJSONResponse({
+            "query": request.query,
+            "results": [_result_dict(r) for r in results],
+            "context": format_context(results),
+            "retrieval_time_ms": retrieval_time
+        })
         
-        return RAGQueryResponse(
-            query=request.query,
-            results=[
-                RAGResult(
-                    text=r.text,
-                    score=r.score,
-                    header=r.metadata.get("header", ""),
-                    source=r.metadata.get("source", "")
-                )
-                for r in results
-            ],
-            context=context,
-            retrieval_time_ms=round(retrieval_time, 2)
+    except Exception as e:
+        logger.error(f"RAG query failed: {e}")
+        raise HTTPException(
+            status_code=500,
+            detail=f"RAG query failed: {str(e)}"
         )
+
+
+@router.post("/rag/query/stream")
+async def query_rag_stream(request: RAGQueryRequest) -> StreamingResponse:
+    """
+    Query the RAG pipeline and stream the response as NDJSON.
+    
+    The first line holds the query, results and timing; each following
+    line holds a {"context": ...} piece. Concatenated, the pieces equal the
+    context returned by /rag/query, so a UI can render results before the
+    context has arrived.
+    
+    Args:
+        request: Query request with search text
         
+    Returns:
+        StreamingResponse of newline-delimited JSON objects
+    """
+    try:
+        # Retrieve before streaming so failures still return a 500
+        results, retrieval_time = await _run_query(request)
     except Exception as e:
         logger.error(f"RAG query failed: {e}")
         raise HTTPException(
             status_code=500,
             detail=f"RAG query failed: {str(e)}"
         )
+    
+    async def lines():
+        yield orjson.dumps({
+            "query": request.query,
+            "results": [_result_dict(r) for r in results],
+            "retrieval_time_ms": retrieval_time
+        }) + b"\n"
+        for i, result in enumerate(results):
+            piece = result.text if i == 0 else CONTEXT_SEPARATOR + result.text
+            yield orjson.dumps({"context": piece}) + b"\n"
+    
+    return StreamingResponse(lines(), media_type="application/x-ndjson")
 
 
 @router.get("/rag/stats")
@@ -122,15 +227,18 @@ async def get_rag_stats():
     Returns:
         Statistics about the knowledge base and configuration
     """
-    from rag import get_qdrant_service
-    
     settings = get_rag_settings()
-    qdrant = get_qdrant_service()
     
     try:
-        info = await qdrant.get_collection_info()
+        # Collection info only changes on ingestion; reuse it briefly so
+        # dashboard polling doesn't hit Qdrant on every request
+        now = time.monotonic()
+        if now - _stats_cache["fetched_at"] >= STATS_TTL_SECONDS:
+            _stats_cache["info"] = await get_qdrant_service().get_collection_info()
+            _stats_cache["fetched_at"] = now
+        info = _stats_cache["info"]
         
-        return {
+        return ORJSONResponse({
             "collection": {
                 "name": settings.qdrant_collection_name,
                 "exists": info is not None,
@@ -143,9 +251,15 @@ async def get_rag_stats():
                 "chunk_size": settings.chunk_size,
                 "chunk_overlap": settings.chunk_overlap,
                 "top_k": settings.top_k,
-                "score_threshold": settings.score_threshold
-            }
-        }
+                "score_threshold": settings.score_threshold,
+                "qdrant_pool_size": settings.qdrant_pool_size,
+                # Quantized search trades a little recall for memory bandwidth;
+                # oversampled candidates are rescored with the stored originals
+                "quantization": settings.quantization,
+                "quantization_oversampling": settings.quantization_oversampling
+            },
+            "query_cache": get_query_cache().stats()
+        }, headers={"Cache-Control": f"max-age={STATS_TTL_SECONDS}"})
         
     except Exception as e:
         logger.error(f"Failed to get RAG stats: {e}")
@@ -166,14 +280,8 @@ async def clear_context():
         Success status
     """
     try:
-        import json
-        import os
-        
-        context_file = os.path.join(os.path.dirname(__file__), "..", "..", "rag_context.json")
-        
-        # Clear the context file by writing empty data
-        with open(context_file, "w", encoding="utf-8") as f:
-            json.dump({"query": "", "context": "", "timestamp": None}, f, ensure_ascii=False)
+        # Clear the context file by writing empty data (off the event loop)
+        await asyncio.to_thread(CONTEXT_FILE.write_bytes, _EMPTY_CONTEXT_FILE)
         
         return {"success": True, "message": "Context cleared"}
         
@@ -197,29 +305,32 @@ async def get_current_context():
         The last RAG query and context, or empty if none
     """
     try:
-        # Import from agent tools (note: this runs in separate process, so we 
-        # need a different approach - use file-based sharing)
-        import json
-        import os
-        
-        context_file = os.path.join(os.path.dirname(__file__), "..", "..", "rag_context.json")
+        # The agent runs in a separate process and shares its context
+        # through a file; stat and read it off the event loop
+        try:
+            stat = await asyncio.to_thread(CONTEXT_FILE.stat)
+        except FileNotFoundError:
+            return {
+                "query": "",
+                "context": "",
+                "timestamp": None,
+                "has_context": False
+            }
         
-        if os.path.exists(context_file):
-            with open(context_file, "r", encoding="utf-8") as f:
-                data = json.load(f)
-                return {
-                    "query": data.get("query", ""),
-                    "context": data.get("context", ""),
-                    "timestamp": data.get("timestamp"),
-                    "has_context": bool(data.get("context"))
-                }
+        # Frontend polls mostly see an unchanged file; reuse the encoded body
+        key = (stat.st_mtime_ns, stat.st_size)
+        if _context_cache["key"] != key:
+            raw = await asyncio.to_thread(CONTEXT_FILE.read_bytes)
+            data = orjson.loads(raw)
+            _context_cache["body"] = orjson.dumps({
+                "query": data.get("query", ""),
+                "context": data.get("context", ""),
+                "timestamp": data.get("timestamp"),
+                "has_context": bool(data.get("context"))
+            })
+            _context_cache["key"] = key
         
-        return {
-            "query": "",
-            "context": "",
-            "timestamp": None,
-            "has_context": False
-        }
+        return Response(content=_context_cache["body"], media_type="application/json")
         
     except Exception as e:
         logger.error(f"Failed to get RAG context: {e}")
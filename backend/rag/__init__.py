@@ -5,15 +5,27 @@ Retrieval-Augmented Generation pipeline for knowledge-grounded responses.
 """
 
 from .config import get_rag_settings, validate_settings, RAGSettings
-from .embeddings import embed_text, embed_query, embed_document, embed_batch
+from .embeddings import (
+    embed_text,
+    embed_query,
+    embed_document,
+    embed_batch,
+    clear_query_embedding_cache
+)
 from .chunker import MarkdownChunker, Chunk, chunk_markdown_file
+from .bm25 import BM25Index
 from .qdrant_service import QdrantService, get_qdrant_service, qdrant_lifespan
 from .retriever import (
     Retriever,
     RetrievalResult,
+    CONTEXT_SEPARATOR,
+    format_context,
+    format_sources,
+    reciprocal_rank_fusion,
     create_system_prompt_with_context,
     VOARA_SYSTEM_PROMPT
 )
+from .semantic_cache import SemanticCache
 
 __all__ = [
     # Config
@@ -25,10 +37,13 @@ __all__ = [
     "embed_query",
     "embed_document",
     "embed_batch",
+    "clear_query_embedding_cache",
     # Chunking
     "MarkdownChunker",
     "Chunk",
     "chunk_markdown_file",
+    # Lexical search
+    "BM25Index",
     # Qdrant
     "QdrantService",
     "get_qdrant_service",
@@ -36,6 +51,12 @@ __all__ = [
     # Retriever
     "Retriever",
     "RetrievalResult",
+    "CONTEXT_SEPARATOR",
+    "format_context",
+    "format_sources",
+    "reciprocal_rank_fusion",
     "create_system_prompt_with_context",
     "VOARA_SYSTEM_PROMPT",
+    # Semantic Cache
+    "SemanticCache",
 ]
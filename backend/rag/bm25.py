@@ -0,0 +1,114 @@
+"""
+BM25 Lexical Index Module
+
+In-memory Okapi BM25 index over knowledge base chunks. Used alongside dense
+vector search so exact keyword matches (plan names, prices, product terms)
+are not missed when the query embedding drifts.
+"""
+
+import heapq
+import math
+import re
+from collections import Counter, defaultdict
+
+# Unicode-aware word tokens (covers both English and Arabic text)
+_TOKEN_PATTERN = re.compile(r"\w+", re.UNICODE)
+
+# Frequent English function words that carry no retrieval signal
+_STOPWORDS = frozenset({
+    "a", "an", "and", "are", "as", "at", "be", "by", "can", "do", "does",
+    "for", "from", "how", "i", "in", "is", "it", "me", "my", "of", "on",
+    "or", "the", "to", "what", "when", "where", "which", "who", "why",
+    "with", "you", "your",
+})
+
+
+def tokenize(text: str) -> list[str]:
+    """
+    Split text into lowercase word tokens, dropping stopwords.
+    
+    Args:
+        text: The text to tokenize
+        
+    Returns:
+        List of tokens
+    """
+    return [
+        token for token in _TOKEN_PATTERN.findall(text.lower())
+        if token not in _STOPWORDS
+    ]
+
+
+class BM25Index:
+    """
+    Okapi BM25 index with precomputed postings.
+    
+    Documents are tokenized once at build time; a search only touches the
+    postings of the query's terms.
+    """
+    
+    def __init__(
+        self,
+        documents: list[str],
+        k1: float = 1.5,
+        b: float = 0.75
+    ):
+        """
+        Build the index.
+        
+        Args:
+            documents: Document texts, addressed by their list index
+            k1: Term frequency saturation
+            b: Document length normalization
+        """
+        self.k1 = k1
+        self.b = b
+        
+        term_freqs = [Counter(tokenize(doc)) for doc in documents]
+        doc_lengths = [sum(tf.values()) for tf in term_freqs]
+        avg_length = sum(doc_lengths) / len(documents) if documents else 0.0
+        
+        # term -> [(doc index, term frequency)]
+        self._postings: dict[str, list[tuple[int, int]]] = defaultdict(list)
+        for doc_index, tf in enumerate(term_freqs):
+            for term, freq in tf.items():
+                self._postings[term].append((doc_index, freq))
+        
+        doc_count = len(documents)
+        self._idf = {
+            term: math.log((doc_count - len(postings) + 0.5) / (len(postings) + 0.5) + 1.0)
+            for term, postings in self._postings.items()
+        }
+        
+        # Length normalization term of the BM25 denominator, per document
+        self._norms = [
+            k1 * (1 - b + b * length / avg_length) if avg_length else k1
+            for length in doc_lengths
+        ]
+        self._size = doc_count
+    
+    def __len__(self) -> int:
+        return self._size
+    
+    def search(self, query: str, top_k: int) -> list[tuple[int, float]]:
+        """
+        Score documents against a query.
+        
+        Args:
+            query: The search query
+            top_k: Maximum number of results
+            
+        Returns:
+            List of (document index, score) pairs, best first
+        """
+        scores: dict[int, float] = defaultdict(float)
+        
+        for term in set(tokenize(query)):
+            postings = self._postings.get(term)
+            if not postings:
+                continue
+            idf = self._idf[term]
+            for doc_index, freq in postings:
+                scores[doc_index] += idf * freq * (self.k1 + 1) / (freq + self._norms[doc_index])
+        
+        return heapq.nlargest(top_k, scores.items(), key=lambda item: item[1])
@@ -17,6 +17,15 @@ class RAGSettings(BaseSettings):
     qdrant_url: str = Field(default="", description="Qdrant Cloud URL")
     qdrant_api_key: str = Field(default="", description="Qdrant API key")
     qdrant_collection_name: str = Field(default="voara_kb", description="Qdrant collection name")
+    qdrant_pool_size: int = Field(default=64, description="Max concurrent HTTP connections to Qdrant")
+    qdrant_prefer_grpc: bool = Field(
+        default=False,
+        description="Talk to Qdrant over gRPC (port 6334), sending vectors as packed floats instead of JSON"
+    )
+    qdrant_vector_datatype: str = Field(
+        default="float32",
+        description="Storage type of collection vectors: 'float32' or 'float16' (halves stored size)"
+    )
     
     # Google AI Configuration
     google_api_key: str = Field(default="", description="Google AI API key")
@@ -31,9 +40,36 @@ class RAGSettings(BaseSettings):
     top_k: int = Field(default=3, description="Number of chunks to retrieve")
     score_threshold: float = Field(default=0.3, description="Minimum similarity score threshold")
     
+    # Hybrid Search Configuration
+    hybrid_search: bool = Field(default=True, description="Fuse BM25 keyword ranking with dense search")
+    rrf_k: int = Field(default=60, description="Reciprocal rank fusion constant")
+    
+    # HNSW Index Configuration
+    hnsw_m: int = Field(default=16, description="HNSW graph degree (edges per node)")
+    hnsw_ef_construct: int = Field(default=100, description="HNSW candidate list size during index build")
+    hnsw_ef: int = Field(default=64, description="HNSW candidate list size during search")
+    
+    # Quantization Configuration
+    quantization: str = Field(default="int8", description="Vector quantization: 'int8', 'binary' or 'none'")
+    quantization_always_ram: bool = Field(default=True, description="Keep quantized vectors in RAM")
+    quantization_oversampling: float = Field(
+        default=2.0,
+        description="Candidates fetched per result from quantized vectors before rescoring with the stored originals"
+    )
+    
+    # Semantic Cache Configuration
+    cache_max_entries: int = Field(default=128, description="Maximum cached queries before LRU eviction")
+    cache_ttl_seconds: float = Field(default=300.0, description="Lifetime of a cached retrieval in seconds")
+    query_embedding_cache_size: int = Field(
+        default=2048,
+        description="Maximum exact query strings whose embeddings are kept in memory"
+    )
+    cache_similarity_threshold: float = Field(
+        default=0.95,
+        description="Minimum cosine similarity between query embeddings for a cache hit"
+    )
+    
     class Config:
-        env_file = ".env"
-        env_file_encoding = "utf-8"
         extra = "ignore"
 
 
@@ -6,6 +6,9 @@ Supports both document and query embedding with appropriate task types.
 """
 
 import asyncio
+import hashlib
+import weakref
+from collections import OrderedDict
 from functools import lru_cache
 from typing import Optional
 
@@ -17,6 +20,10 @@ from .config import get_rag_settings
 # Module-level client initialization flag
 _initialized = False
 
+# Exact query -> embedding LRU, keyed by the SHA-1 of the query text.
+# Embeddings are deterministic for a fixed model, so entries never expire.
+_query_embeddings: OrderedDict[bytes, list[float]] = OrderedDict()
+
 
 def _ensure_initialized() -> None:
     """Ensure the Google AI client is initialized."""
@@ -53,6 +60,99 @@ def embed_text_sync(
     return result["embedding"]
 
 
+def embed_texts_sync(
+    texts: list[str],
+    task_type: str = "retrieval_document"
+) -> list[list[float]]:
+    """
+    Generate embeddings for several texts in one API request (synchronous).
+    
+    Args:
+        texts: The texts to embed
+        task_type: Either "retrieval_document" for documents or "retrieval_query" for queries
+        
+    Returns:
+        List of embedding vectors, in the order of texts
+    """
+    _ensure_initialized()
+    settings = get_rag_settings()
+    
+    # A list of contents is sent as a single batchEmbedContents call
+    result = genai.embed_content(
+        model=settings.embedding_model,
+        content=texts,
+        task_type=task_type
+    )
+    
+    return result["embedding"]
+
+
+class AsyncBatcher:
+    """
+    Coalesces concurrent embedding requests into batched API calls.
+    
+    An idle batcher embeds a text immediately. Texts submitted while a call
+    is in flight are queued and sent together in the next call, so a burst of
+    N concurrent queries costs a couple of round-trips instead of N, without
+    adding latency to a lone query.
+    """
+    
+    def __init__(self, task_type: str, max_batch_size: int = 100):
+        """
+        Initialize the batcher.
+        
+        Args:
+            task_type: Task type used for every text
+            max_batch_size: Maximum texts per API call (API limit is 100)
+        """
+        self.task_type = task_type
+        self.max_batch_size = max_batch_size
+        self._pending: list[tuple[str, asyncio.Future]] = []
+        self._worker: Optional[asyncio.Task] = None
+    
+    async def submit(self, text: str) -> list[float]:
+        """
+        Embed a text as part of the next batch.
+        
+        Args:
+            text: The text to embed
+            
+        Returns:
+            List of floats representing the embedding vector
+        """
+        future = asyncio.get_running_loop().create_future()
+        self._pending.append((text, future))
+        
+        # The worker runs as its own task so a cancelled caller can't strand
+        # the other requests in its batch
+        if self._worker is None or self._worker.done():
+            self._worker = asyncio.create_task(self._drain())
+        
+        return await future
+    
+    async def _drain(self) -> None:
+        """Embed queued texts batch by batch until the queue is empty."""
+        while self._pending:
+            batch = self._pending[:self.max_batch_size]
+            del self._pending[:self.max_batch_size]
+            texts = [text for text, _ in batch]
+            
+            try:
+                if len(texts) == 1:
+                    embeddings = [await embed_text(texts[0], self.task_type)]
+                else:
+                    embeddings = await asyncio.to_thread(embed_texts_sync, texts, self.task_type)
+            except Exception as e:
+                for _, future in batch:
+                    if not future.done():
+                        future.set_exception(e)
+                continue
+            
+            for (_, future), embedding in zip(batch, embeddings):
+                if not future.done():
+                    future.set_result(embedding)
+
+
 async def embed_text(
     text: str,
     task_type: str = "retrieval_document"
@@ -81,6 +181,7 @@ async def embed_query(query: str) -> list[float]:
     """
     Generate embedding for a search query.
     Uses RETRIEVAL_QUERY task type for optimized query embeddings.
+    Repeats of the exact same query are served from an in-memory LRU.
     
     Args:
         query: The search query text
@@ -88,7 +189,39 @@ async def embed_query(query: str) -> list[float]:
     Returns:
         List of floats representing the embedding vector (768 dimensions)
     """
-    return await embed_text(query, task_type="retrieval_query")
+    key = hashlib.sha1(query.encode("utf-8")).digest()
+    embedding = _query_embeddings.get(key)
+    if embedding is not None:
+        _query_embeddings.move_to_end(key)
+        return embedding
+    
+    embedding = await _get_query_batcher().submit(query)
+    
+    _query_embeddings[key] = embedding
+    if len(_query_embeddings) > get_rag_settings().query_embedding_cache_size:
+        _query_embeddings.popitem(last=False)
+    return embedding
+
+
+def clear_query_embedding_cache() -> None:
+    """Drop all cached query embeddings (e.g. after changing the model)."""
+    _query_embeddings.clear()
+
+
+# One batcher per event loop: its futures and worker task belong to that
+# loop, and agent jobs may each run their own loop in a separate thread
+_query_batchers: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, AsyncBatcher]" = (
+    weakref.WeakKeyDictionary()
+)
+
+
+def _get_query_batcher() -> AsyncBatcher:
+    """Get the query batcher for the running event loop."""
+    loop = asyncio.get_running_loop()
+    batcher = _query_batchers.get(loop)
+    if batcher is None:
+        batcher = _query_batchers[loop] = AsyncBatcher(task_type="retrieval_query")
+    return batcher
 
 
 async def embed_document(document: str) -> list[float]:
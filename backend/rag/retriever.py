@@ -5,17 +5,23 @@ High-level retrieval interface that combines embedding and vector search.
 Provides formatted context for LLM consumption.
 """
 
+import asyncio
 import logging
 import time
-from dataclasses import dataclass
+import weakref
+from dataclasses import dataclass, replace
 from typing import Optional
 
+from .bm25 import BM25Index
 from .config import get_rag_settings
 from .embeddings import embed_query
-from .qdrant_service import get_qdrant_service, ScoredPoint
+from .qdrant_service import get_qdrant_service, QdrantService, ScoredPoint, Record
 
 logger = logging.getLogger(__name__)
 
+# Placed between chunks in formatted LLM context
+CONTEXT_SEPARATOR = "\n\n---\n\n"
+
 
 @dataclass
 class RetrievalResult:
@@ -24,20 +30,85 @@ class RetrievalResult:
     text: str
     score: float
     metadata: dict
+    id: str = ""
+    header: str = ""
+    source: str = ""
+    
+    def __post_init__(self):
+        # Lift the commonly read metadata fields into attributes once
+        if not self.header:
+            self.header = self.metadata.get("header", "")
+        if not self.source:
+            self.source = self.metadata.get("source", "")
     
     @classmethod
     def from_scored_point(cls, point: ScoredPoint) -> "RetrievalResult":
         """Create from a Qdrant ScoredPoint."""
+        return cls.from_record(point, score=point.score)
+    
+    @classmethod
+    def from_record(cls, point: Record, score: float = 0.0) -> "RetrievalResult":
+        """Create from a Qdrant Record (e.g. a scrolled point)."""
         payload = point.payload or {}
         return cls(
             text=payload.get("text", ""),
-            score=point.score,
+            score=score,
             metadata={
                 k: v for k, v in payload.items() if k != "text"
-            }
+            },
+            id=str(point.id)
         )
 
 
+# Process-wide BM25 index over every chunk, with the chunks it indexes.
+# Built on the first hybrid search; restart the process after re-ingesting.
+_lexical_index: Optional[tuple[BM25Index, list[RetrievalResult]]] = None
+
+# Guards the load, per event loop: asyncio locks are bound to one loop, and
+# agent jobs may each run their own loop in a separate thread
+_lexical_index_locks: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, asyncio.Lock]" = (
+    weakref.WeakKeyDictionary()
+)
+
+# After a failed load, searches stay dense-only until this monotonic time
+# instead of re-scrolling the whole collection on every query
+LEXICAL_INDEX_RETRY_SECONDS = 60.0
+_lexical_index_retry_at = 0.0
+
+
+async def _get_lexical_index(
+    qdrant: QdrantService
+) -> Optional[tuple[BM25Index, list[RetrievalResult]]]:
+    """Load (once) the BM25 index over the collection's chunks."""
+    global _lexical_index, _lexical_index_retry_at
+    if _lexical_index is None:
+        if time.monotonic() < _lexical_index_retry_at:
+            return None
+        # Concurrent first searches on a loop share a single scroll
+        loop = asyncio.get_running_loop()
+        lock = _lexical_index_locks.get(loop)
+        if lock is None:
+            lock = _lexical_index_locks[loop] = asyncio.Lock()
+        async with lock:
+            if _lexical_index is None:
+                # A search that waited on a failed load doesn't retry it
+                if time.monotonic() < _lexical_index_retry_at:
+                    return None
+                try:
+                    records = await qdrant.scroll_points()
+                    chunks = [RetrievalResult.from_record(r) for r in records]
+                    _lexical_index = (BM25Index([c.text for c in chunks]), chunks)
+                    logger.info(f"BM25 index built over {len(chunks)} chunks")
+                except Exception as e:
+                    _lexical_index_retry_at = time.monotonic() + LEXICAL_INDEX_RETRY_SECONDS
+                    logger.warning(
+                        f"BM25 index unavailable, using dense search only for "
+                        f"{LEXICAL_INDEX_RETRY_SECONDS:.0f}s: {e}"
+                    )
+                    return None
+    return _lexical_index
+
+
 class Retriever:
     """
     RAG Retriever combining embedding and vector search.
@@ -48,7 +119,8 @@ class Retriever:
     def __init__(
         self,
         top_k: Optional[int] = None,
-        score_threshold: Optional[float] = None
+        score_threshold: Optional[float] = None,
+        hybrid: Optional[bool] = None
     ):
         """
         Initialize the retriever.
@@ -56,10 +128,12 @@ class Retriever:
         Args:
             top_k: Number of chunks to retrieve (default from settings)
             score_threshold: Minimum similarity score (default from settings)
+            hybrid: Fuse BM25 keyword ranking with dense search (default from settings)
         """
         self.settings = get_rag_settings()
         self.top_k = top_k or self.settings.top_k
         self.score_threshold = score_threshold or self.settings.score_threshold
+        self.hybrid = self.settings.hybrid_search if hybrid is None else hybrid
         self.qdrant = get_qdrant_service()
     
     async def retrieve(
@@ -83,38 +157,98 @@ class Retriever:
             logger.warning("Empty query provided to retriever")
             return []
         
-        top_k = top_k or self.top_k
-        score_threshold = score_threshold or self.score_threshold
-        
         start_time = time.time()
         
         try:
-            # Generate query embedding
-            query_embedding = await embed_query(query)
+            # Generate query embedding, loading the BM25 index meanwhile
+            query_embedding, _ = await asyncio.gather(embed_query(query), self.prepare())
             embed_time = time.time() - start_time
             
-            # Search Qdrant
-            search_start = time.time()
-            results = await self.qdrant.search(
-                query_vector=query_embedding,
+            results = await self.search_by_vector(
+                query_embedding,
                 top_k=top_k,
-                score_threshold=score_threshold
+                score_threshold=score_threshold,
+                query=query
             )
-            search_time = time.time() - search_start
             
             total_time = time.time() - start_time
             
             logger.info(
                 f"Retrieval completed: {len(results)} results in {total_time:.3f}s "
-                f"(embed: {embed_time:.3f}s, search: {search_time:.3f}s)"
+                f"(embed: {embed_time:.3f}s, search: {total_time - embed_time:.3f}s)"
             )
             
-            return [RetrievalResult.from_scored_point(p) for p in results]
+            return results
             
         except Exception as e:
             logger.error(f"Retrieval error: {e}")
             raise
     
+    async def prepare(self) -> None:
+        """
+        Load the BM25 index ahead of a search, if hybrid search is enabled.
+        
+        Callers that embed the query themselves can run this concurrently
+        with the embedding so the first search doesn't pay for both in turn.
+        """
+        if self.hybrid:
+            await _get_lexical_index(self.qdrant)
+    
+    async def search_by_vector(
+        self,
+        query_embedding: list[float],
+        top_k: Optional[int] = None,
+        score_threshold: Optional[float] = None,
+        query: Optional[str] = None
+    ) -> list[RetrievalResult]:
+        """
+        Retrieve relevant chunks for an already-embedded query.
+        
+        Lets callers that embed the query themselves (e.g. the semantic
+        cache) skip a second embedding round-trip. When hybrid search is
+        enabled and the query text is given, the top 2*top_k dense and BM25
+        hits are merged with reciprocal rank fusion. BM25 hits are only
+        added when dense search found something above the score threshold.
+        
+        Args:
+            query_embedding: The query embedding vector
+            top_k: Override number of results
+            score_threshold: Override minimum score
+            query: The query text, used for BM25 ranking
+            
+        Returns:
+            List of RetrievalResult objects sorted by relevance
+        """
+        top_k = top_k or self.top_k
+        score_threshold = score_threshold or self.score_threshold
+        
+        lexical_index = None
+        if self.hybrid and query:
+            lexical_index = await _get_lexical_index(self.qdrant)
+        
+        candidates = top_k * 2 if lexical_index else top_k
+        
+        points = await self.qdrant.search(
+            query_vector=query_embedding,
+            top_k=candidates,
+            score_threshold=score_threshold
+        )
+        dense = [RetrievalResult.from_scored_point(p) for p in points]
+        
+        # BM25 has no relevance floor: with no dense hit above the score
+        # threshold, a single shared common word must not bring in context
+        if lexical_index is None or not dense:
+            return dense
+        
+        bm25, chunks = lexical_index
+        lexical = [chunks[i] for i, _ in bm25.search(query, candidates)]
+        
+        return reciprocal_rank_fusion(
+            [dense, lexical],
+            top_k=top_k,
+            k=self.settings.rrf_k
+        )
+    
     async def retrieve_context(
         self,
         query: str,
@@ -133,24 +267,7 @@ class Retriever:
             Formatted context string ready for LLM prompt
         """
         results = await self.retrieve(query, top_k)
-        
-        if not results:
-            return ""
-        
-        context_parts = []
-        
-        for i, result in enumerate(results, 1):
-            if include_metadata:
-                header = result.metadata.get("header", "")
-                source = result.metadata.get("source", "unknown")
-                if header:
-                    context_parts.append(f"[{i}] {header}\n{result.text}")
-                else:
-                    context_parts.append(f"[{i}] {result.text}")
-            else:
-                context_parts.append(result.text)
-        
-        return "\n\n---\n\n".join(context_parts)
+        return format_context(results, include_metadata=include_metadata)
     
     async def retrieve_with_sources(
         self,
@@ -170,25 +287,100 @@ class Retriever:
             Tuple of (context_string, list of source dicts)
         """
         results = await self.retrieve(query, top_k)
+        return format_sources(results)
+
+
+def format_sources(results: list[RetrievalResult]) -> tuple[str, list[dict]]:
+    """
+    Build a context string and source summaries from retrieval results.
+    
+    Args:
+        results: Retrieved chunks, best first
         
-        if not results:
-            return "", []
+    Returns:
+        Tuple of (context_string, list of source dicts)
+    """
+    if not results:
+        return "", []
+    
+    context_parts = []
+    sources = []
+    
+    for i, result in enumerate(results, 1):
+        context_parts.append(result.text)
+        sources.append({
+            "index": i,
+            "text": result.text[:100] + "..." if len(result.text) > 100 else result.text,
+            "score": round(result.score, 3),
+            "header": result.header,
+            "source": result.source or "unknown"
+        })
+    
+    context = "\n\n".join(context_parts)
+    return context, sources
+
+
+def reciprocal_rank_fusion(
+    rankings: list[list[RetrievalResult]],
+    top_k: int,
+    k: int = 60
+) -> list[RetrievalResult]:
+    """
+    Merge ranked result lists with reciprocal rank fusion.
+    
+    Each result scores sum(1 / (k + rank)) over the lists it appears in
+    (matched by id); the fused score replaces the original score.
+    
+    Args:
+        rankings: Result lists, each sorted best first
+        top_k: Number of fused results to return
+        k: Fusion constant damping the weight of top ranks
         
-        context_parts = []
-        sources = []
+    Returns:
+        Fused results sorted by fused score
+    """
+    fused_scores: dict[str, float] = {}
+    results_by_id: dict[str, RetrievalResult] = {}
+    
+    for ranking in rankings:
+        for rank, result in enumerate(ranking, 1):
+            fused_scores[result.id] = fused_scores.get(result.id, 0.0) + 1.0 / (k + rank)
+            results_by_id.setdefault(result.id, result)
+    
+    best = sorted(fused_scores, key=fused_scores.get, reverse=True)[:top_k]
+    return [replace(results_by_id[i], score=fused_scores[i]) for i in best]
+
+
+def format_context(
+    results: list[RetrievalResult],
+    include_metadata: bool = False
+) -> str:
+    """
+    Format retrieval results as context for LLM consumption.
+    
+    Args:
+        results: Retrieval results sorted by relevance
+        include_metadata: Include section headers in context
         
-        for i, result in enumerate(results, 1):
+    Returns:
+        Formatted context string ready for LLM prompt
+    """
+    if not results:
+        return ""
+    
+    context_parts = []
+    
+    for i, result in enumerate(results, 1):
+        if include_metadata:
+            header = result.header
+            if header:
+                context_parts.append(f"[{i}] {header}\n{result.text}")
+            else:
+                context_parts.append(f"[{i}] {result.text}")
+        else:
             context_parts.append(result.text)
-            sources.append({
-                "index": i,
-                "text": result.text[:100] + "..." if len(result.text) > 100 else result.text,
-                "score": round(result.score, 3),
-                "header": result.metadata.get("header", ""),
-                "source": result.metadata.get("source", "unknown")
-            })
-        
-        context = "\n\n".join(context_parts)
-        return context, sources
+    
+    return CONTEXT_SEPARATOR.join(context_parts)
 
 
 def create_system_prompt_with_context(
@@ -0,0 +1,261 @@
+"""
+Semantic Cache Module
+
+In-process cache of retrieval results keyed by query text and query embedding.
+Repeated or paraphrased queries reuse earlier results instead of searching again.
+"""
+
+import asyncio
+import logging
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Optional
+
+import numpy as np
+
+from .config import get_rag_settings
+from .embeddings import embed_query
+from .retriever import Retriever, RetrievalResult, format_context, format_sources
+
+logger = logging.getLogger(__name__)
+
+
+# Marks a matrix row that holds no cached query
+_EMPTY_SLOT = -1
+
+
+@dataclass
+class _CacheEntry:
+    """A cached retrieval and the matrix row holding its query embedding."""
+    
+    slot: int
+    results: list[RetrievalResult]
+    created_at: float
+
+
+class SemanticCache:
+    """
+    Semantic cache in front of a Retriever.
+    
+    Exact repeats of a query are served from an LRU dict without embedding.
+    Other queries are embedded once and compared against the cached query
+    embeddings; if the best cosine similarity clears the threshold the cached
+    results are reused, otherwise the retriever searches with that embedding.
+    """
+    
+    def __init__(
+        self,
+        retriever: Optional[Retriever] = None,
+        max_entries: Optional[int] = None,
+        ttl_seconds: Optional[float] = None,
+        similarity_threshold: Optional[float] = None
+    ):
+        """
+        Initialize the cache.
+        
+        Args:
+            retriever: Retriever used on cache misses (default: new Retriever)
+            max_entries: Maximum cached queries before LRU eviction (default from settings)
+            ttl_seconds: Lifetime of a cached retrieval (default from settings)
+            similarity_threshold: Minimum cosine similarity for a hit (default from settings)
+        """
+        settings = get_rag_settings()
+        self.retriever = retriever or Retriever()
+        self.max_entries = max_entries or settings.cache_max_entries
+        self.ttl_seconds = ttl_seconds or settings.cache_ttl_seconds
+        self.similarity_threshold = similarity_threshold or settings.cache_similarity_threshold
+        self._entries: OrderedDict[tuple, _CacheEntry] = OrderedDict()
+        
+        # Query embeddings live in one contiguous (max_entries, dim) float32
+        # matrix, L2-normalized on insert, so a lookup is a single matvec.
+        # The matrix is allocated on first insert, once the dimension is known.
+        self._matrix: Optional[np.ndarray] = None
+        self._slot_top_k = np.full(self.max_entries, _EMPTY_SLOT, dtype=np.int64)
+        self._slot_keys: list[Optional[tuple]] = [None] * self.max_entries
+        self._free_slots = list(range(self.max_entries - 1, -1, -1))
+        
+        self.hits = 0
+        self.misses = 0
+    
+    def __len__(self) -> int:
+        return len(self._entries)
+    
+    def clear(self) -> None:
+        """Drop all cached retrievals."""
+        for entry in self._entries.values():
+            self._release(entry.slot)
+        self._entries.clear()
+    
+    async def retrieve(
+        self,
+        query: str,
+        top_k: Optional[int] = None
+    ) -> list[RetrievalResult]:
+        """
+        Retrieve relevant chunks, serving from the cache when possible.
+        
+        Args:
+            query: The search query
+            top_k: Override number of results
+            
+        Returns:
+            List of RetrievalResult objects sorted by relevance
+        """
+        if not query.strip():
+            return []
+        
+        now = time.monotonic()
+        self._evict_expired(now)
+        
+        key = (" ".join(query.lower().split()), top_k)
+        entry = self._entries.get(key)
+        if entry is not None:
+            self._entries.move_to_end(key)
+            self.hits += 1
+            logger.debug(f"Semantic cache exact hit for: {query[:50]}")
+            return entry.results
+        
+        # Embed while the retriever loads anything it needs for a miss
+        query_embedding, _ = await asyncio.gather(embed_query(query), self.retriever.prepare())
+        vector = _normalize(query_embedding)
+        
+        entry = self._find_similar(vector, top_k)
+        if entry is not None:
+            self.hits += 1
+            logger.info(f"Semantic cache hit for: {query[:50]}")
+            # Alias the new phrasing so its next repeat is an exact hit
+            self._store(key, vector, entry.results, top_k, entry.created_at)
+            return entry.results
+        
+        self.misses += 1
+        results = await self.retriever.search_by_vector(
+            query_embedding,
+            top_k=top_k,
+            query=query
+        )
+        self._store(key, vector, results, top_k, now)
+        
+        return results
+    
+    async def retrieve_context(
+        self,
+        query: str,
+        top_k: Optional[int] = None,
+        include_metadata: bool = False
+    ) -> str:
+        """
+        Retrieve and format context for LLM consumption.
+        
+        Args:
+            query: The search query
+            top_k: Number of chunks to retrieve
+            include_metadata: Include source information in context
+            
+        Returns:
+            Formatted context string ready for LLM prompt
+        """
+        results = await self.retrieve(query, top_k)
+        return format_context(results, include_metadata=include_metadata)
+    
+    async def retrieve_with_sources(
+        self,
+        query: str,
+        top_k: Optional[int] = None
+    ) -> tuple[str, list[dict]]:
+        """
+        Retrieve context with separate source information.
+        
+        Args:
+            query: The search query
+            top_k: Number of chunks to retrieve
+            
+        Returns:
+            Tuple of (context_string, list of source dicts)
+        """
+        results = await self.retrieve(query, top_k)
+        return format_sources(results)
+    
+    def stats(self) -> dict:
+        """
+        Get cache statistics.
+        
+        Returns:
+            Dict with entry count, capacity, hits, misses and hit rate
+        """
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "max_entries": self.max_entries,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 3) if lookups else 0.0
+        }
+    
+    def _find_similar(
+        self,
+        vector: np.ndarray,
+        top_k: Optional[int]
+    ) -> Optional[_CacheEntry]:
+        """Return the most similar cached entry above the threshold, if any."""
+        if self._matrix is None or not self._entries:
+            return None
+        
+        scores = self._matrix @ vector
+        scores[self._slot_top_k != (top_k or 0)] = -np.inf
+        slot = int(np.argmax(scores))
+        
+        if scores[slot] < self.similarity_threshold:
+            return None
+        
+        key = self._slot_keys[slot]
+        self._entries.move_to_end(key)
+        return self._entries[key]
+    
+    def _store(
+        self,
+        key: tuple,
+        vector: np.ndarray,
+        results: list[RetrievalResult],
+        top_k: Optional[int],
+        created_at: float
+    ) -> None:
+        """Insert an entry, evicting the least recently used one when full."""
+        existing = self._entries.pop(key, None)
+        if existing is not None:
+            self._release(existing.slot)
+        
+        if not self._free_slots:
+            _, evicted = self._entries.popitem(last=False)
+            self._release(evicted.slot)
+        
+        if self._matrix is None:
+            self._matrix = np.zeros((self.max_entries, vector.shape[0]), dtype=np.float32)
+        
+        slot = self._free_slots.pop()
+        self._matrix[slot] = vector
+        self._slot_top_k[slot] = top_k or 0
+        self._slot_keys[slot] = key
+        self._entries[key] = _CacheEntry(slot, results, created_at)
+    
+    def _release(self, slot: int) -> None:
+        """Return a matrix row to the free list."""
+        self._slot_top_k[slot] = _EMPTY_SLOT
+        self._slot_keys[slot] = None
+        self._free_slots.append(slot)
+    
+    def _evict_expired(self, now: float) -> None:
+        """Remove entries older than the TTL."""
+        expired = [
+            key for key, entry in self._entries.items()
+            if now - entry.created_at > self.ttl_seconds
+        ]
+        for key in expired:
+            self._release(self._entries.pop(key).slot)
+
+
+def _normalize(embedding: list[float]) -> np.ndarray:
+    """L2-normalize an embedding so dot products are cosine similarities."""
+    vector = np.asarray(embedding, dtype=np.float32)
+    norm = np.linalg.norm(vector)
+    return vector / norm if norm else vector
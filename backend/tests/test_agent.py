@@ -54,6 +54,32 @@ class TestAgentConfig:
         assert settings.enable_rag is True
         assert settings.rag_top_k == 3
     
+    def test_generation_settings_defaults(self, mock_env):
+        """Test thinking is disabled and output is uncapped by default."""
+        from agent.config import get_agent_settings
+        
+        get_agent_settings.cache_clear()
+        settings = get_agent_settings()
+        
+        assert settings.thinking_budget == 0
+        assert settings.max_output_tokens is None
+    
+    def test_thinking_budget_model_default(self, mock_env):
+        """Test -1 restores the model's default thinking and lower values are rejected."""
+        from pydantic import ValidationError
+        from agent.config import get_agent_settings
+        
+        with patch.dict(os.environ, {"THINKING_BUDGET": "-1"}):
+            get_agent_settings.cache_clear()
+            assert get_agent_settings().thinking_budget == -1
+        
+        with patch.dict(os.environ, {"THINKING_BUDGET": "-2"}):
+            get_agent_settings.cache_clear()
+            with pytest.raises(ValidationError):
+                get_agent_settings()
+        
+        get_agent_settings.cache_clear()
+    
     def test_validate_agent_settings_success(self, mock_env):
         """Test settings validation with all required vars."""
         from agent.config import validate_agent_settings, get_agent_settings
@@ -85,6 +111,48 @@ class TestAgentConfig:
         assert len(errors) > 0
         assert "LIVEKIT_URL" in errors
     
+    def test_get_agent_settings_validates_once(self, mock_env):
+        """Test that loading settings validates required vars."""
+        from agent.config import get_agent_settings
+        
+        with patch.dict(os.environ, {"LIVEKIT_URL": ""}):
+            get_agent_settings.cache_clear()
+            with pytest.raises(ValueError, match="LIVEKIT_URL"):
+                get_agent_settings()
+        
+        get_agent_settings.cache_clear()
+        assert get_agent_settings() is get_agent_settings()
+    
+    def test_import_loads_dotenv_before_retriever(self, tmp_path):
+        """Test the shared retriever sees settings from .env when only .env is present."""
+        import subprocess
+        import sys
+        from pathlib import Path
+
+        (tmp_path / ".env").write_text(
+            "QDRANT_URL=https://dotenv.qdrant.io\n"
+            "QDRANT_API_KEY=dotenv-qdrant-key\n"
+            "GOOGLE_API_KEY=dotenv-google-key\n"
+        )
+        env = {
+            k: v for k, v in os.environ.items()
+            if k not in ("QDRANT_URL", "QDRANT_API_KEY", "GOOGLE_API_KEY")
+        }
+        env["PYTHONPATH"] = str(Path(__file__).parent.parent)
+        script = (
+            "import agent\n"
+            "from agent._retriever import RETRIEVER\n"
+            "print(RETRIEVER.retriever.qdrant.settings.qdrant_url)\n"
+        )
+
+        result = subprocess.run(
+            [sys.executable, "-c", script],
+            cwd=tmp_path, env=env, capture_output=True, text=True, timeout=60,
+        )
+
+        assert result.returncode == 0, result.stderr
+        assert result.stdout.strip().splitlines()[-1] == "https://dotenv.qdrant.io"
+
     def test_system_instructions_exist(self):
         """Test that system instructions are defined."""
         from agent.config import VOARA_SYSTEM_INSTRUCTIONS
@@ -204,6 +272,70 @@ class TestCreateAgent:
         assert agent.enable_rag is False
 
 
+class TestSessionEvents:
+    """Tests for session event handlers."""
+    
+    def test_transcript_handler_runs_inline(self, mock_env):
+        """Test transcripts are handled without spawning tasks."""
+        from agent.voice_agent import VoaraAgent, setup_session_events
+        
+        handlers = {}
+        session = MagicMock()
+        session.on.side_effect = lambda name: lambda fn: handlers.setdefault(name, fn)
+        
+        setup_session_events(session, VoaraAgent(enable_rag=False), MagicMock())
+        
+        event = MagicMock(is_final=True, transcript="  What is Voara?  ")
+        with patch("asyncio.create_task") as mock_create_task:
+            handlers["user_input_transcribed"](event)
+        
+        mock_create_task.assert_not_called()
+
+
+class TestSmallTalkFilter:
+    """Tests for the knowledge base tool's small-talk pre-filter."""
+    
+    def test_small_talk_is_trivial(self, mock_env):
+        """Test greetings and affirmations skip retrieval."""
+        from agent.tools import _is_trivial
+        
+        for query in ["Hi!", "thank you", "ok, thanks a lot", "Hello there", "شكرا", "  "]:
+            assert _is_trivial(query), query
+    
+    def test_real_questions_are_not_trivial(self, mock_env):
+        """Test short but real queries still search."""
+        from agent.tools import _is_trivial
+        
+        for query in ["pricing", "What plans do you offer?", "hi, what are your prices?"]:
+            assert not _is_trivial(query), query
+
+
+class TestKnowledgeBaseTool:
+    """Tests for the search_knowledge_base tool."""
+    
+    @pytest.mark.asyncio
+    async def test_context_written_in_background(self, mock_env, tmp_path):
+        """Test the result is returned and the context file written afterwards."""
+        import asyncio
+        import json
+        from agent import tools
+        
+        mock_retriever = MagicMock()
+        mock_retriever.retrieve_context = AsyncMock(return_value="Starter plan: $29/month")
+        context_file = tmp_path / "rag_context.json"
+        
+        with patch.object(tools, "RETRIEVER", mock_retriever), \
+             patch.object(tools, "CONTEXT_FILE", str(context_file)):
+            result = await tools.search_knowledge_base(MagicMock(), "What plans do you offer?")
+            
+            assert result == "Starter plan: $29/month"
+            await asyncio.gather(*tools._pending_writes)
+        
+        saved = json.loads(context_file.read_text(encoding="utf-8"))
+        assert saved["query"] == "What plans do you offer?"
+        assert saved["context"] == "Starter plan: $29/month"
+
+
 class TestAgentProperties:
     """Tests for agent properties."""
     
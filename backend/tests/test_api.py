@@ -21,6 +21,7 @@ def mock_env():
         "GOOGLE_API_KEY": "test-google-key",
         "QDRANT_URL": "https://test.qdrant.io",
         "QDRANT_API_KEY": "test-qdrant-key",
+        "VOARA_DEBUG": "true",
     }
     with patch.dict(os.environ, env_vars):
         yield
@@ -46,6 +47,22 @@ def client():
             yield test_client
 
 
+@pytest.fixture
+def mock_search():
+    """Stub the shared retriever's vector search and the query embedding."""
+    from api.routes.rag import get_retriever, get_query_cache
+    
+    get_retriever.cache_clear()
+    get_query_cache.cache_clear()
+    try:
+        with patch.object(get_retriever(), "search_by_vector", new_callable=AsyncMock) as search, \
+             patch("rag.semantic_cache.embed_query", AsyncMock(return_value=[1.0, 0.0])):
+            yield search
+    finally:
+        get_retriever.cache_clear()
+        get_query_cache.cache_clear()
+
+
 class TestRootEndpoint:
     """Tests for the root endpoint."""
     
@@ -58,6 +75,36 @@ class TestRootEndpoint:
         assert data["name"] == "Voara Voice Agent API"
         assert "version" in data
         assert data["docs"] == "/docs"
+    
+    def test_openapi_schema_served_once_encoded(self, client):
+        """Test the OpenAPI schema route is replaced by the cached one."""
+        from api.main import app
+        
+        first = client.get("/openapi.json")
+        second = client.get("/openapi.json")
+        
+        assert first.status_code == 200
+        assert first.content == second.content
+        assert "/api/rag/query" in first.json()["paths"]
+        assert [getattr(r, "path", None) for r in app.router.routes].count("/openapi.json") == 1
+    
+    def test_startup_does_not_wait_for_qdrant(self):
+        """Test the app serves requests while the Qdrant check is pending."""
+        import asyncio
+        
+        async def never_finishes():
+            await asyncio.Event().wait()
+        
+        mock_service = MagicMock()
+        mock_service.collection_exists = AsyncMock(side_effect=never_finishes)
+        mock_service.close = AsyncMock()
+        
+        with patch("api.main.get_qdrant_service", return_value=mock_service):
+            from api.main import app
+            with TestClient(app) as test_client:
+                assert test_client.get("/").status_code == 200
+        
+        mock_service.close.assert_awaited_once()
 
 
 class TestTokenEndpoint:
@@ -186,9 +233,131 @@ class TestRAGEndpoint:
         
         assert response.status_code == 422  # Validation error
     
+    def test_rag_query_uses_cache(self, client, mock_search):
+        """Test a repeated query is answered from the semantic cache."""
+        from api.routes.rag import get_query_cache
+        from rag import RetrievalResult
+        
+        mock_search.return_value = [
+            RetrievalResult(text="Voara builds voice agents.", score=0.9, metadata={"header": "About"})
+        ]
+        
+        for _ in range(2):
+            response = client.post("/api/rag/query", json={"query": "What does Voara do?"})
+            assert response.status_code == 200
+            data = response.json()
+            assert data["results"][0]["header"] == "About"
+            assert data["context"] == "Voara builds voice agents."
+        
+        mock_search.assert_awaited_once()
+        assert get_query_cache().hits == 1
+        assert get_query_cache().misses == 1
+    
+    def test_rag_context_endpoint(self, client):
+        """Test the latest agent context is served as JSON."""
+        response = client.get("/api/rag/context")
+        
+        assert response.status_code == 200
+        assert response.headers["content-type"] == "application/json"
+        assert "has_context" in response.json()
+    
+    def test_rag_context_reread_on_change(self, client, tmp_path):
+        """Test the context file is re-read only when it changes."""
+        import json
+        from api.routes import rag as rag_routes
+        
+        context_file = tmp_path / "rag_context.json"
+        context_file.write_text(json.dumps({"query": "q1", "context": "c1", "timestamp": None}))
+        
+        with patch.object(rag_routes, "CONTEXT_FILE", context_file), \
+             patch.dict(rag_routes._context_cache, {"key": None, "body": b""}):
+            assert client.get("/api/rag/context").json()["query"] == "q1"
+            
+            context_file.write_text(json.dumps({"query": "q2", "context": "", "timestamp": None}))
+            data = client.get("/api/rag/context").json()
+            assert data["query"] == "q2"
+            assert data["has_context"] is False
+    
+    def test_large_responses_compressed(self, client, tmp_path):
+        """Test large JSON responses are gzip-compressed."""
+        import json
+        from api.routes import rag as rag_routes
+        
+        context_file = tmp_path / "rag_context.json"
+        context_file.write_text(json.dumps({"query": "q", "context": "pricing " * 500, "timestamp": None}))
+        
+        with patch.object(rag_routes, "CONTEXT_FILE", context_file), \
+             patch.dict(rag_routes._context_cache, {"key": None, "body": b""}):
+            response = client.get("/api/rag/context", headers={"Accept-Encoding": "gzip"})
+        
+        assert response.headers["content-encoding"] == "gzip"
+        assert response.json()["has_context"] is True
+    
+    def test_clear_context(self, client, tmp_path):
+        """Test clearing the context resets the shared file."""
+        import json
+        from api.routes import rag as rag_routes
+        
+        context_file = tmp_path / "rag_context.json"
+        context_file.write_text(json.dumps({"query": "q1", "context": "c1", "timestamp": None}))
+        
+        with patch.object(rag_routes, "CONTEXT_FILE", context_file):
+            response = client.delete("/api/rag/context")
+        
+        assert response.json()["success"] is True
+        assert json.loads(context_file.read_text())["context"] == ""
+    
+    def test_rag_query_stream(self, client, mock_search):
+        """Test the streaming endpoint sends results first, then the context."""
+        import json
+        from rag import RetrievalResult
+        
+        mock_search.return_value = [
+            RetrievalResult(text="Starter is $29.", score=0.9, metadata={}),
+            RetrievalResult(text="Pro is $99.", score=0.8, metadata={})
+        ]
+        
+        response = client.post("/api/rag/query/stream", json={"query": "Plans?"})
+        
+        lines = [json.loads(line) for line in response.text.splitlines()]
+        assert response.headers["content-type"] == "application/x-ndjson"
+        assert len(lines[0]["results"]) == 2
+        assert "".join(line["context"] for line in lines[1:]) == "Starter is $29.\n\n---\n\nPro is $99."
+    
+    def test_rag_query_stream_not_gzipped(self, client, mock_search):
+        """Test the stream bypasses gzip so lines aren't buffered until close."""
+        from rag import RetrievalResult
+        
+        mock_search.return_value = [
+            RetrievalResult(text="Starter is $29. " * 200, score=0.9, metadata={})
+        ]
+        
+        response = client.post(
+            "/api/rag/query/stream",
+            json={"query": "Plans?"},
+            headers={"Accept-Encoding": "gzip"}
+        )
+        
+        assert "content-encoding" not in response.headers
+        assert "gzip" not in response.headers.get("vary", "").lower()
+        assert len(response.text.splitlines()) == 2
+    
+    def test_retriever_is_shared(self, client):
+        """Test the route reuses one Retriever across requests."""
+        from api.routes.rag import get_retriever, get_query_cache
+        
+        get_query_cache.cache_clear()
+        
+        assert get_retriever() is get_retriever()
+        assert get_query_cache().retriever is get_retriever()
+        get_query_cache.cache_clear()
+    
     def test_rag_stats_endpoint(self, client):
         """Test RAG stats endpoint."""
-        with patch("rag.get_qdrant_service") as mock_qdrant:
+        from api.routes import rag as rag_routes
+        
+        with patch("api.routes.rag.get_qdrant_service") as mock_qdrant, \
+             patch.dict(rag_routes._stats_cache, {"fetched_at": float("-inf"), "info": None}):
             mock_service = MagicMock()
             mock_service.get_collection_info = AsyncMock(return_value={
                 "name": "voara_kb",
@@ -203,6 +372,13 @@ class TestRAGEndpoint:
             data = response.json()
             assert "collection" in data
             assert "config" in data
+            assert data["query_cache"]["hits"] >= 0
+            
+            # A second request within the TTL is served without Qdrant
+            second = client.get("/api/rag/stats")
+            assert second.json()["collection"] == data["collection"]
+            assert second.headers["cache-control"] == "max-age=10"
+            mock_service.get_collection_info.assert_awaited_once()
 
 
 class TestCORSMiddleware:
@@ -218,3 +394,13 @@ class TestCORSMiddleware:
         # CORS should allow the localhost origin
         # Note: Actual header checking depends on middleware configuration
         assert response.status_code in [200, 400]  # OPTIONS may return different codes
+    
+    def test_cors_preflight_cached(self, client):
+        """Test preflight responses allow browser caching."""
+        response = client.options("/api/rag/query", headers={
+            "Origin": "https://preview-123.vercel.app",
+            "Access-Control-Request-Method": "POST"
+        })
+        
+        assert response.status_code == 200
+        assert response.headers["access-control-max-age"] == "86400"
@@ -103,12 +103,78 @@ class TestEmbeddingIntegration:
         with patch("rag.embeddings.embed_text", new_callable=AsyncMock) as mock_embed:
             mock_embed.return_value = mock_embedding
             
-            from rag.embeddings import embed_query
+            from rag.embeddings import embed_query, clear_query_embedding_cache
+            clear_query_embedding_cache()
             result = await embed_query("What is Voara AI?")
             
             # Verify result
             assert result == mock_embedding
     
+    @pytest.mark.asyncio
+    async def test_concurrent_queries_are_batched(self, mock_env):
+        """Test concurrent embed_query calls share one batched API call."""
+        import asyncio
+        
+        def fake_batch(texts, task_type):
+            return [[float(len(text))] for text in texts]
+        
+        with patch("rag.embeddings.embed_texts_sync", side_effect=fake_batch) as mock_batch:
+            from rag.embeddings import embed_query, clear_query_embedding_cache
+            clear_query_embedding_cache()
+            results = await asyncio.gather(
+                embed_query("a"),
+                embed_query("bb"),
+                embed_query("ccc")
+            )
+            
+            assert results == [[1.0], [2.0], [3.0]]
+            mock_batch.assert_called_once_with(["a", "bb", "ccc"], "retrieval_query")
+    
+    def test_concurrent_event_loops_get_their_own_batcher(self, mock_env):
+        """Test queries on overlapping loops in separate threads all complete."""
+        import asyncio
+        import threading
+        import time
+        
+        def slow_embed(text, task_type):
+            time.sleep(0.2)
+            return [float(len(text))]
+        
+        results = {}
+        
+        def run(query):
+            results[query] = asyncio.run(asyncio.wait_for(embed_query(query), timeout=5))
+        
+        with patch("rag.embeddings.embed_text_sync", side_effect=slow_embed):
+            from rag.embeddings import embed_query, clear_query_embedding_cache
+            clear_query_embedding_cache()
+            threads = [threading.Thread(target=run, args=(q,)) for q in ("a", "bb", "ccc")]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+        
+        clear_query_embedding_cache()
+        assert results == {"a": [1.0], "bb": [2.0], "ccc": [3.0]}
+    
+    @pytest.mark.asyncio
+    async def test_repeated_query_embedding_cached(self, mock_env):
+        """Test an exact repeat of a query does not call the API again."""
+        from rag.embeddings import embed_query, clear_query_embedding_cache
+        
+        clear_query_embedding_cache()
+        
+        with patch("rag.embeddings.embed_text", new_callable=AsyncMock) as mock_embed:
+            mock_embed.return_value = [0.2] * 768
+            
+            first = await embed_query("What are your pricing plans?")
+            second = await embed_query("What are your pricing plans?")
+            
+            assert first == second
+            mock_embed.assert_awaited_once()
+        
+        clear_query_embedding_cache()
+    
     @pytest.mark.asyncio
     async def test_embed_document_calls_embed_text(self, mock_env):
         """Test that embed_document calls embed_text correctly."""
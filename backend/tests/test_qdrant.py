@@ -66,6 +66,22 @@ class TestQdrantService:
         
         assert service1 is service2
     
+    @pytest.mark.asyncio
+    async def test_get_client_created_once(self, mock_env):
+        """Test the async client is created lazily and reused."""
+        with patch("rag.qdrant_service.AsyncQdrantClient") as mock_client_class:
+            from rag.qdrant_service import QdrantService
+            
+            service = QdrantService()
+            
+            client1 = await service.get_client()
+            client2 = await service.get_client()
+            
+            assert client1 is client2
+            mock_client_class.assert_called_once()
+            assert mock_client_class.call_args.kwargs["pool_size"] == service.settings.qdrant_pool_size
+            assert mock_client_class.call_args.kwargs["prefer_grpc"] is False
+    
     @pytest.mark.asyncio
     async def test_create_collection_called(self, mock_env):
         """Test create_collection makes correct API call."""
@@ -84,6 +100,24 @@ class TestQdrantService:
             
             assert result is True
             mock_client.create_collection.assert_called_once()
+            
+            hnsw_config = mock_client.create_collection.call_args.kwargs["hnsw_config"]
+            assert hnsw_config.m == service.settings.hnsw_m
+            
+            vectors_config = mock_client.create_collection.call_args.kwargs["vectors_config"]
+            assert vectors_config.datatype == "float32"
+            
+            quantization = mock_client.create_collection.call_args.kwargs["quantization_config"]
+            assert quantization.scalar.type == "int8"
+    
+    def test_binary_quantization_config(self, mock_env):
+        """Test binary quantization can be selected."""
+        from rag.qdrant_service import QdrantService
+        
+        service = QdrantService()
+        service.settings = service.settings.model_copy(update={"quantization": "binary"})
+        
+        assert service._quantization_config().binary.always_ram is True
     
     @pytest.mark.asyncio
     async def test_collection_exists_method(self, mock_env):
@@ -123,6 +157,11 @@ class TestQdrantService:
             
             # Results should be list of dicts
             assert isinstance(results, list)
+            
+            # HNSW search breadth comes from settings
+            search_params = mock_client.query_points.call_args.kwargs["search_params"]
+            assert search_params.hnsw_ef == service.settings.hnsw_ef
+            assert search_params.quantization.rescore is True
     
     @pytest.mark.asyncio
     async def test_upsert_vectors(self, mock_env):
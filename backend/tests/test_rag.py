@@ -4,8 +4,10 @@ Tests for the RAG Pipeline
 Run with: poetry run pytest tests/test_rag.py -v
 """
 
+import time
 import pytest
 from pathlib import Path
+from unittest.mock import patch, MagicMock, AsyncMock
 
 from rag.chunker import MarkdownChunker, Chunk
 
@@ -176,3 +178,289 @@ Yes. Voara AI uses Retrieval-Augmented Generation to retrieve answers from your
         # FAQ content should be in chunks
         all_text = " ".join(c.text for c in chunks)
         assert "voice recordings" in all_text.lower() or "no" in all_text.lower()
+
+
+class TestSemanticCache:
+    """Tests for the SemanticCache retrieval wrapper."""
+    
+    @pytest.fixture
+    def retriever(self):
+        """Mock retriever returning a single result."""
+        from rag.retriever import RetrievalResult
+        
+        retriever = MagicMock()
+        retriever.prepare = AsyncMock()
+        retriever.search_by_vector = AsyncMock(return_value=[
+            RetrievalResult(text="Voara AI builds voice agents.", score=0.9, metadata={})
+        ])
+        return retriever
+    
+    @pytest.mark.asyncio
+    async def test_exact_repeat_skips_embedding(self, retriever):
+        """Test that repeating a query is served without embedding or search."""
+        from rag.semantic_cache import SemanticCache
+        
+        cache = SemanticCache(retriever, max_entries=8, ttl_seconds=60, similarity_threshold=0.95)
+        
+        with patch("rag.semantic_cache.embed_query", new_callable=AsyncMock) as mock_embed:
+            mock_embed.return_value = [1.0, 0.0, 0.0]
+            
+            first = await cache.retrieve_context("What is Voara AI?")
+            second = await cache.retrieve_context("  what is   voara ai? ")
+        
+        assert first == second == "Voara AI builds voice agents."
+        mock_embed.assert_called_once()
+        retriever.search_by_vector.assert_called_once()
+    
+    @pytest.mark.asyncio
+    async def test_similar_query_hits_cache(self, retriever):
+        """Test that a paraphrase above the threshold reuses cached results."""
+        from rag.semantic_cache import SemanticCache
+        
+        cache = SemanticCache(retriever, max_entries=8, ttl_seconds=60, similarity_threshold=0.95)
+        
+        with patch("rag.semantic_cache.embed_query", new_callable=AsyncMock) as mock_embed:
+            mock_embed.side_effect = [[1.0, 0.0, 0.0], [0.99, 0.05, 0.0], [0.0, 1.0, 0.0]]
+            
+            await cache.retrieve("What is Voara AI?")
+            await cache.retrieve("Tell me what Voara AI is")
+            assert retriever.search_by_vector.call_count == 1
+            
+            await cache.retrieve("How much does it cost?")
+            assert retriever.search_by_vector.call_count == 2
+    
+    @pytest.mark.asyncio
+    async def test_similar_query_respects_top_k(self, retriever):
+        """Test that a cached retrieval is only reused for the same top_k."""
+        from rag.semantic_cache import SemanticCache
+        
+        cache = SemanticCache(retriever, max_entries=8, ttl_seconds=60, similarity_threshold=0.95)
+        
+        with patch("rag.semantic_cache.embed_query", new_callable=AsyncMock) as mock_embed:
+            mock_embed.side_effect = [[1.0, 0.0], [1.0, 0.0]]
+            
+            await cache.retrieve("pricing", top_k=3)
+            await cache.retrieve("pricing plans", top_k=5)
+        
+        assert retriever.search_by_vector.call_count == 2
+        
+        cache.clear()
+        assert len(cache) == 0
+    
+    @pytest.mark.asyncio
+    async def test_lru_eviction_and_ttl(self, retriever):
+        """Test that entries are evicted over capacity and after the TTL."""
+        from rag.semantic_cache import SemanticCache
+        
+        cache = SemanticCache(retriever, max_entries=2, ttl_seconds=60, similarity_threshold=0.95)
+        
+        with patch("rag.semantic_cache.embed_query", new_callable=AsyncMock) as mock_embed:
+            mock_embed.side_effect = [[1.0, 0.0], [0.0, 1.0], [-1.0, 0.0], [1.0, 0.0], [0.0, -1.0]]
+            
+            await cache.retrieve("first")
+            await cache.retrieve("second")
+            await cache.retrieve("third")
+            assert len(cache) == 2
+            
+            # "first" was evicted, so it is searched again
+            await cache.retrieve("first")
+            assert retriever.search_by_vector.call_count == 4
+            
+            with patch("rag.semantic_cache.time.monotonic", return_value=time.monotonic() + 120):
+                await cache.retrieve("fourth")
+            
+            # Both older entries expired; only the fresh one remains
+            assert len(cache) == 1
+
+
+class TestBM25Index:
+    """Tests for the BM25 lexical index."""
+    
+    def test_tokenize_drops_stopwords(self):
+        """Test tokenization lowercases and drops stopwords."""
+        from rag.bm25 import tokenize
+        
+        assert tokenize("What is the Pro Plan?") == ["pro", "plan"]
+    
+    def test_search_ranks_keyword_matches(self):
+        """Test that documents containing the query terms rank first."""
+        from rag.bm25 import BM25Index
+        
+        index = BM25Index([
+            "Voara AI builds voice agents for customer service.",
+            "The Pro plan costs $99 per month with 5,000 minutes.",
+            "Contact support by email at any time.",
+        ])
+        
+        results = index.search("How much is the Pro plan?", top_k=3)
+        
+        assert results[0][0] == 1
+        assert all(score > 0 for _, score in results)
+    
+    def test_search_without_matches(self):
+        """Test that unknown terms return no results."""
+        from rag.bm25 import BM25Index
+        
+        index = BM25Index(["Voara AI builds voice agents."])
+        
+        assert index.search("quantum", top_k=3) == []
+
+
+class TestHybridRetrieval:
+    """Tests for reciprocal rank fusion and hybrid search."""
+    
+    def test_result_lifts_header_and_source(self):
+        """Test header and source are read from metadata once."""
+        from rag.retriever import RetrievalResult
+        
+        point = MagicMock(id=7, score=0.8, payload={"text": "Plans", "header": "Pricing", "source": "faq.md"})
+        result = RetrievalResult.from_scored_point(point)
+        
+        assert result.header == "Pricing"
+        assert result.source == "faq.md"
+        assert result.id == "7"
+    
+    def test_reciprocal_rank_fusion(self):
+        """Test that results ranked well in both lists win."""
+        from rag.retriever import RetrievalResult, reciprocal_rank_fusion
+        
+        a = RetrievalResult(text="a", score=0.9, metadata={}, id="a")
+        b = RetrievalResult(text="b", score=0.8, metadata={}, id="b")
+        c = RetrievalResult(text="c", score=0.0, metadata={}, id="c")
+        
+        fused = reciprocal_rank_fusion([[a, b], [b, c]], top_k=2, k=60)
+        
+        assert [r.id for r in fused] == ["b", "a"]
+        assert fused[0].score == pytest.approx(1 / 62 + 1 / 61)
+    
+    @pytest.mark.asyncio
+    async def test_embedding_overlaps_index_load(self):
+        """Test the query is embedded while the BM25 index loads."""
+        import asyncio
+        from rag import retriever as retriever_module
+        from rag.retriever import Retriever
+        
+        index_loading = asyncio.Event()
+        
+        async def load_index(qdrant):
+            index_loading.set()
+            return None
+        
+        async def embed(query):
+            # Deadlocks (and times out) if the index load waits for the embedding
+            await index_loading.wait()
+            return [0.1, 0.2]
+        
+        with patch.object(retriever_module, "get_qdrant_service"), \
+             patch.object(retriever_module, "_get_lexical_index", side_effect=load_index), \
+             patch.object(retriever_module, "embed_query", side_effect=embed):
+            retriever = Retriever(hybrid=True)
+            retriever.qdrant.search = AsyncMock(return_value=[])
+            
+            results = await asyncio.wait_for(retriever.retrieve("pricing"), timeout=1)
+        
+        assert results == []
+    
+    @pytest.mark.asyncio
+    async def test_search_by_vector_fuses_bm25(self):
+        """Test that hybrid search adds keyword hits missed by dense search."""
+        from rag import retriever as retriever_module
+        from rag.bm25 import BM25Index
+        from rag.retriever import Retriever, RetrievalResult
+        
+        dense_point = MagicMock(id="dense", score=0.8, payload={"text": "Voara AI overview"})
+        chunks = [
+            RetrievalResult(text="Voara AI overview", score=0.0, metadata={}, id="dense"),
+            RetrievalResult(text="Enterprise pricing is custom.", score=0.0, metadata={}, id="lexical"),
+        ]
+        
+        retriever = Retriever(top_k=2, hybrid=True)
+        retriever.qdrant = MagicMock()
+        retriever.qdrant.search = AsyncMock(return_value=[dense_point])
+        
+        lexical_index = (BM25Index([c.text for c in chunks]), chunks)
+        with patch.object(retriever_module, "_lexical_index", lexical_index):
+            results = await retriever.search_by_vector([0.1] * 768, query="enterprise pricing")
+        
+        assert {r.id for r in results} == {"dense", "lexical"}
+        assert retriever.qdrant.search.call_args.kwargs["top_k"] == 4
+    
+    @pytest.mark.asyncio
+    async def test_search_by_vector_skips_bm25_without_dense_hits(self):
+        """Test that keyword hits alone don't make an off-topic query relevant."""
+        from rag import retriever as retriever_module
+        from rag.bm25 import BM25Index
+        from rag.retriever import Retriever, RetrievalResult
+        
+        chunks = [
+            RetrievalResult(text="Our support team can help you.", score=0.0, metadata={}, id="support"),
+            RetrievalResult(text="Enterprise pricing is custom.", score=0.0, metadata={}, id="pricing"),
+        ]
+        
+        retriever = Retriever(top_k=2, hybrid=True)
+        retriever.qdrant = MagicMock()
+        retriever.qdrant.search = AsyncMock(return_value=[])
+        
+        lexical_index = (BM25Index([c.text for c in chunks]), chunks)
+        with patch.object(retriever_module, "_lexical_index", lexical_index):
+            results = await retriever.search_by_vector(
+                [0.1] * 768, query="Can you help me order a pizza?"
+            )
+        
+        assert results == []
+    
+    @pytest.mark.asyncio
+    async def test_failed_index_load_is_not_retried_every_query(self):
+        """Test a failed scroll falls back to dense-only search until the backoff expires."""
+        from rag import retriever as retriever_module
+        
+        qdrant = MagicMock()
+        qdrant.scroll_points = AsyncMock(side_effect=RuntimeError("forbidden"))
+        
+        with patch.object(retriever_module, "_lexical_index", None), \
+             patch.object(retriever_module, "_lexical_index_retry_at", 0.0):
+            assert await retriever_module._get_lexical_index(qdrant) is None
+            assert await retriever_module._get_lexical_index(qdrant) is None
+            assert qdrant.scroll_points.await_count == 1
+            
+            retriever_module._lexical_index_retry_at = 0.0
+            assert await retriever_module._get_lexical_index(qdrant) is None
+            assert qdrant.scroll_points.await_count == 2
+    
+    def test_index_load_from_concurrent_event_loops(self):
+        """Test jobs running their own loops in separate threads can load the index."""
+        import asyncio
+        import threading
+        from rag import retriever as retriever_module
+        
+        async def slow_scroll():
+            await asyncio.sleep(0.1)
+            return [MagicMock(id=1, payload={"text": "Voara AI pricing"})]
+        
+        qdrant = MagicMock()
+        qdrant.scroll_points = slow_scroll
+        errors = []
+        
+        async def load_twice():
+            # Two searches on the same loop contend for its lock
+            await asyncio.gather(
+                retriever_module._get_lexical_index(qdrant),
+                retriever_module._get_lexical_index(qdrant)
+            )
+        
+        def run():
+            try:
+                asyncio.run(load_twice())
+            except Exception as e:
+                errors.append(e)
+        
+        with patch.object(retriever_module, "_lexical_index", None), \
+             patch.object(retriever_module, "_lexical_index_retry_at", 0.0):
+            threads = [threading.Thread(target=run) for _ in range(2)]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+            
+            assert errors == []
+            assert retriever_module._lexical_index is not None